@@ -2,6 +2,15 @@ import os
 import json
 from round1a.pdf_parser import extract_text_blocks
 from round1a.heading_model import infer_headings
+from utils.archive_utils import is_archive, iter_archive_pdfs
+
+def _save_result(output_dir, fname, spans):
+    result = infer_headings(spans)
+    output_path = os.path.join(output_dir, os.path.splitext(fname)[0] + ".json")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Saved {output_path}")
 
 def run_round1a():
     input_dir = os.environ.get("INPUT_DIR", "input")
@@ -9,18 +18,25 @@ def run_round1a():
     
     os.makedirs(output_dir, exist_ok=True)
     
+    if is_archive(input_dir):
+        # Stream members straight from the zip/tar without unpacking
+        print(f"Processing PDFs from archive {input_dir}...")
+        for member, data in iter_archive_pdfs(input_dir):
+            # Keep the member's folder so a/x.pdf and b/x.pdf don't collide
+            rel_path = os.path.normpath(member).lstrip("/\\")
+            if rel_path.startswith(".."):
+                print(f"Skipping {member}: path leaves the output directory")
+                continue
+            print(f"Processing {rel_path}...")
+            _save_result(output_dir, rel_path, extract_text_blocks(rel_path, stream=data))
+        return
+    
     print(f"Processing PDFs from {input_dir}...")
     for fname in os.listdir(input_dir):
         if fname.endswith(".pdf"):
             print(f"Processing {fname}...")
             pdf_path = os.path.join(input_dir, fname)
-            spans = extract_text_blocks(pdf_path)
-            result = infer_headings(spans)
-            
-            output_path = os.path.join(output_dir, fname.replace(".pdf", ".json"))
-            with open(output_path, "w") as f:
-                json.dump(result, f, indent=2)
-            print(f"Saved {output_path}")
+            _save_result(output_dir, fname, extract_text_blocks(pdf_path))
 
 if __name__ == "__main__":
     print("Adobe India Hackathon 2024 - Challenge 1A: PDF Heading Extraction")
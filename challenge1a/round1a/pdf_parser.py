@@ -1,13 +1,18 @@
 import fitz  # PyMuPDF
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from collections import defaultdict
 
-def extract_text_blocks(pdf_path: str) -> List[Dict[str, Any]]:
+def extract_text_blocks(pdf_path: str, stream: Optional[bytes] = None) -> List[Dict[str, Any]]:
     """Extract text elements with better text reconstruction inspired by notebook.
     Returns both span-level and block-level elements for better title extraction.
+    When `stream` is given the PDF is opened from memory and `pdf_path` is only
+    used as its name.
     """
     try:
-        doc = fitz.open(pdf_path)
+        if stream is not None:
+            doc = fitz.open(stream=stream, filetype="pdf")
+        else:
+            doc = fitz.open(pdf_path)
     except Exception as e:
         print(f"Error opening PDF {pdf_path}: {e}")
         return []
@@ -0,0 +1,69 @@
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+pytest.importorskip("fitz")
+
+import main
+
+MEMBERS = {
+    "top.pdf": b"%PDF top",
+    "sub/B.PDF": b"%PDF upper-case extension",
+    "a/x.pdf": b"%PDF a",
+    "b/x.pdf": b"%PDF b",
+    "../escape.pdf": b"%PDF outside",
+    "notes.txt": b"ignored",
+}
+
+@pytest.fixture
+def parsed(monkeypatch):
+    seen = {}
+    def fake_extract(name, stream=None):
+        seen[name] = stream
+        return []
+    monkeypatch.setattr(main, "extract_text_blocks", fake_extract)
+    return seen
+
+def _run(monkeypatch, tmp_path, archive):
+    out = tmp_path / "out"
+    monkeypatch.setenv("INPUT_DIR", archive)
+    monkeypatch.setenv("OUTPUT_DIR", str(out))
+    main.run_round1a()
+    return sorted(os.path.relpath(os.path.join(d, f), out) for d, _, fs in os.walk(out) for f in fs)
+
+def _zip(tmp_path):
+    path = str(tmp_path / "in.zip")
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in MEMBERS.items():
+            zf.writestr(name, data)
+    return path
+
+def _targz(tmp_path):
+    path = str(tmp_path / "in.tar.gz")
+    with tarfile.open(path, "w:gz") as tf:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+@pytest.mark.parametrize("make_archive", [_zip, _targz])
+def test_outputs_keep_member_folders(monkeypatch, tmp_path, parsed, make_archive):
+    written = _run(monkeypatch, tmp_path, make_archive(tmp_path))
+    assert written == ["a/x.json", "b/x.json", "sub/B.json", "top.json"]
+    # PDFs are handed over from memory, never as paths on disk
+    assert parsed == {n: d for n, d in MEMBERS.items() if n.lower().endswith(".pdf") and not n.startswith("..")}
+
+def test_traversal_member_is_skipped(monkeypatch, tmp_path, parsed):
+    _run(monkeypatch, tmp_path, _zip(tmp_path))
+    assert not (tmp_path / "escape.json").exists()
+    assert "../escape.pdf" not in parsed
+
+def test_output_is_heading_json(monkeypatch, tmp_path, parsed):
+    _run(monkeypatch, tmp_path, _zip(tmp_path))
+    with open(tmp_path / "out" / "sub" / "B.json") as fh:
+        assert json.load(fh) == {"title": "", "outline": []}
@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import subprocess
+
+# Modes, so the two halves of the scheduler can be told apart:
+#   default   - serial parsing, torch/OpenMP thread counts left to the libraries
+#   threads   - scheduler caps torch/OpenMP threads, parsing stays serial
+#   scheduler - thread caps plus the parse worker pool
+MODES = ("default", "threads", "scheduler")
+
+# Each run happens in a fresh interpreter: torch thread settings are
+# process-global and can't be reset once the pool has started.
+_RUN = """
+import os, sys, json, time
+mode = sys.argv[2]
+os.environ["CPU_SCHEDULER"] = "0" if mode == "default" else "1"
+from round1b.scheduler import get_scheduler
+scheduler = get_scheduler()
+scheduler.limit_native_threads()
+if mode == "threads":
+    scheduler.parse_workers = lambda: 1
+from round1b import processor, semantic_ranker
+semantic_ranker._load_model()
+host_threads = int(sys.argv[3])
+if mode == "default" and host_threads:
+    # What torch picks inside a CPU-quota container: the host's core count
+    import torch
+    torch.set_num_threads(host_threads)
+timings = {"parse": 0.0, "embed": 0.0}
+def _timed(stage, fn):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings[stage] += time.perf_counter() - start
+    return wrapper
+processor._parse_all = _timed("parse", processor._parse_all)
+semantic_ranker.embed_texts = _timed("embed", semantic_ranker.embed_texts)
+query = {'persona': 'Analyst', 'job': 'Summarise the collection', 'top_k': 10}
+start = time.perf_counter()
+processor.process_collection(sys.argv[1], query)
+timings["total"] = time.perf_counter() - start
+import torch
+timings["torch_threads"] = torch.get_num_threads()
+print(json.dumps(timings))
+"""
+
+def _time_run(pdf_dir: str, mode: str, host_threads: int = 0) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _RUN, os.path.abspath(pdf_dir), mode, str(host_threads)],
+        check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def run_benchmark(pdf_dir: str, repeats: int = 3, host_threads: int = 0):
+    from round1b.scheduler import available_cpus
+    print(f"Cores available: {available_cpus()}" + (f", emulated host threads: {host_threads}" if host_threads else ""))
+    best = {}
+    for mode in MODES:
+        runs = [_time_run(pdf_dir, mode, host_threads) for _ in range(repeats)]
+        best[mode] = min(runs, key=lambda r: r["total"])
+        r = best[mode]
+        print(f"{mode:>10}: total {r['total']:.2f}s  parse {r['parse']:.2f}s  "
+              f"embed {r['embed']:.2f}s  torch threads {r['torch_threads']}  (best of {repeats})")
+    base = best["default"]
+    for mode in MODES[1:]:
+        r = best[mode]
+        print(f"{mode:>10} vs default: total {base['total'] / r['total']:.2f}x  "
+              f"parse {base['parse'] / r['parse']:.2f}x  embed {base['embed'] / r['embed']:.2f}x")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python benchmark.py <pdf_dir> [repeats] [emulated_host_threads]")
+        sys.exit(1)
+    run_benchmark(sys.argv[1],
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 3,
+                  int(sys.argv[3]) if len(sys.argv) > 3 else 0)
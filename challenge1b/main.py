@@ -1,6 +1,12 @@
 import os
 import json
+from round1b.scheduler import get_scheduler
+
+# Must run before torch is imported so its OpenMP pool respects the core limit
+get_scheduler().limit_native_threads()
+
 from round1b.processor import process_documents
+from utils.archive_utils import resolve_archive
 
 def run_round1b():
     input_dir = os.environ.get("INPUT_DIR", "input")
@@ -36,10 +42,15 @@ def run_round1b():
             })
         pdf_dir = os.path.join(input_dir, "PDFs")  # Jury uses capital PDFs
     
+    # Accept PDFs.zip / pdfs.tar.gz etc. in place of the PDF folder
+    if not os.path.isdir(pdf_dir):
+        pdf_dir = resolve_archive(pdf_dir) or pdf_dir
+    
     print(f"Processing queries from {query_file}...")
     result = process_documents(pdf_dir, queries)
     
     # Save result
+    os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, "challenge1b_output.json")
     with open(output_path, "w") as f:
         json.dump(result, f, indent=2)
@@ -1,17 +1,112 @@
 import os, json, re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import get_all_start_methods, get_context
 import numpy as np
 
 from round1a.pdf_parser import extract_text_blocks
 from round1a.heading_model import infer_headings, blocks_to_sections
-from round1b.semantic_ranker import embed_texts, cosine_sim_matrix
+from round1b.scheduler import get_scheduler, PARSE, EMBED
+from utils.archive_utils import MemberRef, is_archive, scan_archive, read_member, iter_archive_pdfs
+
+# A document is either a file path or a member of a zip/tar archive
+Source = Union[str, MemberRef]
+
+_POOL = None
+_POOL_WORKERS = 0
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Parse pool shared across collections. Workers are started with
+    forkserver/spawn rather than fork: by the embed stage the parent has a
+    live OpenMP pool, and forking a process in that state can deadlock.
+    """
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        if _POOL is not None:
+            _POOL.shutdown()
+        method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+        _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=get_context(method))
+        _POOL_WORKERS = workers
+    return _POOL
 
 def _list_pdfs(input_dir: str) -> List[str]:
     if not os.path.exists(input_dir):
         return []
     return [os.path.join(input_dir, f) for f in os.listdir(input_dir) if f.lower().endswith('.pdf') and os.path.exists(os.path.join(input_dir, f))]
 
+def _member_labels(refs: List[MemberRef]) -> Dict[str, MemberRef]:
+    """Name archive members by their path inside the archive, minus a single
+    folder that wraps everything (so zipping PDFs/ reads like the folder).
+    Unlike the folder input, members in subfolders are included.
+    """
+    parts = [r.name.strip('/').split('/') for r in refs]
+    if parts and all(len(p) > 1 for p in parts) and len({p[0] for p in parts}) == 1:
+        parts = [p[1:] for p in parts]
+    return {'/'.join(p): r for p, r in zip(parts, refs)}
+
+def _archive_members(input_dir: str, cache: Optional[Dict]) -> Optional[Dict[str, MemberRef]]:
+    """Label -> member for an archive input, else None. Indexed once per
+    cache, since a .tar.gz index is a full decompression pass.
+    """
+    key = ('archive', input_dir)
+    if cache is not None and key in cache:
+        return cache[key]
+    members = _member_labels(scan_archive(input_dir)) if is_archive(input_dir) else None
+    if cache is not None:
+        cache[key] = members
+    return members
+
+def _doc_name(source: Source, labels: Dict[MemberRef, str]) -> str:
+    return labels[source] if isinstance(source, MemberRef) else os.path.basename(source)
+
+def _sections_from_spans(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    outline = infer_headings(spans).get('outline', [])
+    return blocks_to_sections(spans, outline)
+
+def _parse_bytes(name: str, data: bytes) -> List[Dict[str, Any]]:
+    return _sections_from_spans(extract_text_blocks(name, stream=data))
+
+def _parse_sections(source: Source) -> List[Dict[str, Any]]:
+    if isinstance(source, MemberRef):
+        # Each worker reads only its own member, so memory stays bounded
+        # by the number of workers rather than the size of the archive
+        return _parse_bytes(source.name, read_member(source))
+    return _sections_from_spans(extract_text_blocks(source))
+
+def _parse_streamed(refs: List[MemberRef], workers: int) -> List[List[Dict[str, Any]]]:
+    # Compressed tars can't seek to a member: decode them in one pass and
+    # hand each PDF to the pool, keeping at most 2 per worker in flight
+    wanted = {r.name for r in refs}
+    parsed = {}
+    pending = {}
+    pool = _get_pool(workers) if workers > 1 else None
+    for name, data in iter_archive_pdfs(refs[0].archive_path):
+        if name not in wanted:
+            continue
+        if pool is None:
+            parsed[name] = _parse_bytes(name, data)
+            continue
+        if len(pending) >= 2 * workers:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                parsed[pending.pop(fut)] = fut.result()
+        pending[pool.submit(_parse_bytes, name, data)] = name
+    for fut, name in pending.items():
+        parsed[name] = fut.result()
+    return [parsed.get(r.name, []) for r in refs]
+
+def _parse_all(paths: List[Source]) -> List[List[Dict[str, Any]]]:
+    scheduler = get_scheduler()
+    with scheduler.stage(PARSE):
+        workers = min(scheduler.parse_workers(), len(paths))
+        streamed = [p for p in paths if isinstance(p, MemberRef) and p.offset < 0]
+        if streamed and len(streamed) == len(paths):
+            return _parse_streamed(streamed, workers)
+        if workers <= 1:
+            return [_parse_sections(p) for p in paths]
+        return list(_get_pool(workers).map(_parse_sections, paths))
+
 def _to_sentences(text: str) -> List[str]:
     # Simple sentence split to keep dependencies minimal
     parts = re.split(r'(?<=[.!?])\s+', text)
@@ -32,11 +127,23 @@ def _refine_text(section_text: str, query: str, max_sent: int = 5) -> str:
     top = [s for _, s in scored[:max_sent]]
     return " ".join(top)
 
-def process_collection(input_dir: str, query: Dict[str, Any]) -> Dict[str, Any]:
+def process_collection(input_dir: str, query: Dict[str, Any], cache: Optional[Dict] = None) -> Dict[str, Any]:
+    """Rank the sections of a PDF collection for one persona/job query.
+    Pass the same `cache` dict across calls to parse each collection once.
+    """
     # Metadata
     persona = query.get('persona', '')
     job = query.get('job', '')
-    docs = query.get('documents') or _list_pdfs(input_dir)
+    # An archive's members stand in for the PDF folder
+    members = _archive_members(input_dir, cache)
+    archive = members is not None
+    members = members or {}
+    labels = {r: label for label, r in members.items()}
+    by_member_name = {r.name: r for r in members.values()}
+    basenames = {}
+    for label, r in members.items():
+        basenames.setdefault(os.path.basename(label), []).append(r)
+    docs = query.get('documents') or (list(members.values()) if archive else _list_pdfs(input_dir))
     top_k = int(query.get('top_k', 10))
     timestamp = datetime.utcnow().isoformat() + 'Z'
     # Build sections from each doc
@@ -45,7 +152,16 @@ def process_collection(input_dir: str, query: Dict[str, Any]) -> Dict[str, Any]:
     # Validate document paths
     valid_docs = []
     for path in docs:
-        if isinstance(path, str) and os.path.exists(path):
+        if isinstance(path, MemberRef):
+            valid_docs.append(path)
+        elif isinstance(path, str) and archive:
+            # Documents named in the query refer to archive members; a bare
+            # file name only matches if no other member shares it
+            same_base = basenames.get(os.path.basename(path), [])
+            ref = members.get(path) or by_member_name.get(path) or (same_base[0] if len(same_base) == 1 else None)
+            if ref:
+                valid_docs.append(ref)
+        elif isinstance(path, str) and os.path.exists(path):
             valid_docs.append(path)
         elif isinstance(path, str) and not os.path.isabs(path):
             # Try relative to input_dir
@@ -53,14 +169,18 @@ def process_collection(input_dir: str, query: Dict[str, Any]) -> Dict[str, Any]:
             if os.path.exists(full_path):
                 valid_docs.append(full_path)
     
-    for path in valid_docs:
-        spans = extract_text_blocks(path)
-        outline = infer_headings(spans).get('outline', [])
-        sections = blocks_to_sections(spans, outline)
+    key = tuple(valid_docs)
+    if cache is not None and key in cache:
+        parsed = cache[key]
+    else:
+        parsed = _parse_all(valid_docs)
+        if cache is not None:
+            cache[key] = parsed
+    for path, sections in zip(valid_docs, parsed):
         for sec in sections:
             all_sections.append(sec['text'][:3000])  # optimized cap for speed
             section_meta.append({
-                'document': os.path.basename(path),
+                'document': _doc_name(path, labels),
                 'page': sec['page_start'],
                 'section_title': sec['title'],
                 'level': sec['level'],
@@ -68,7 +188,7 @@ def process_collection(input_dir: str, query: Dict[str, Any]) -> Dict[str, Any]:
     if not all_sections:
         return {
             'metadata': {
-                'input_documents': [os.path.basename(p) for p in valid_docs],
+                'input_documents': [_doc_name(p, labels) for p in valid_docs],
                 'persona': persona,
                 'job_to_be_done': job,
                 'processing_timestamp': timestamp,
@@ -78,8 +198,11 @@ def process_collection(input_dir: str, query: Dict[str, Any]) -> Dict[str, Any]:
         }
     # Rank by semantic similarity
     query_text = f"Persona: {persona}. Task: {job}.".strip()
-    sec_emb = embed_texts(all_sections)
-    q_emb = embed_texts([query_text])[0:1]
+    # Imported here so parse workers never load torch
+    from round1b.semantic_ranker import embed_texts, cosine_sim_matrix
+    with get_scheduler().stage(EMBED):
+        sec_emb = embed_texts(all_sections)
+        q_emb = embed_texts([query_text])[0:1]
     sims = cosine_sim_matrix(q_emb, sec_emb)[0]
     order = np.argsort(-sims)[:top_k]
     # Build outputs
@@ -102,11 +225,27 @@ def process_collection(input_dir: str, query: Dict[str, Any]) -> Dict[str, Any]:
         })
     return {
         'metadata': {
-            'input_documents': [os.path.basename(p) for p in docs],
+            'input_documents': [_doc_name(p, labels) for p in docs],
             'persona': persona,
             'job_to_be_done': job,
             'processing_timestamp': timestamp,
         },
         'extracted_sections': extracted,
         'subsection_analysis': subsection
-    }
\ No newline at end of file
+    }
+
+def process_documents(pdf_dir: str, queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run every query against one collection, parsing the PDFs only once."""
+    cache = {}
+    results = []
+    for q in queries:
+        q = dict(q)
+        # Plain {"query": ...} entries are treated as the job to be done
+        q.setdefault('job', q.get('query', ''))
+        result = process_collection(pdf_dir, q, cache=cache)
+        result['query'] = q.get('query', q['job'])
+        results.append(result)
+    return {
+        'results': results,
+        'processing_timestamp': datetime.utcnow().isoformat() + 'Z',
+    }
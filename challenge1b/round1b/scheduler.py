@@ -0,0 +1,170 @@
+import os
+import sys
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Stages of the 1B pipeline. Parsing is process-parallel (PyMuPDF is
+# single-threaded), embedding is thread-parallel inside torch.
+PARSE = "parse"
+EMBED = "embed"
+
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+_SCHEDULER = None
+
+def _read_first_line(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as fh:
+            return fh.readline().strip()
+    except OSError:
+        return None
+
+def _read_lines(path: str) -> List[str]:
+    try:
+        with open(path, 'r') as fh:
+            return [line.strip() for line in fh]
+    except OSError:
+        return []
+
+def _own_cgroups() -> Tuple[str, str]:
+    """(v2 path, v1 cpu controller path) of this process from /proc/self/cgroup.
+    Without a private cgroup namespace these are nested below the root, e.g.
+    /docker/<id> or /kubepods/.../<ctr>, and that's where our quota lives.
+    """
+    v2, v1 = "/", "/"
+    for line in _read_lines("/proc/self/cgroup"):
+        parts = line.split(":", 2)
+        if len(parts) != 3:
+            continue
+        hierarchy, controllers, path = parts
+        if hierarchy == "0" and not controllers:
+            v2 = path or "/"
+        elif "cpu" in controllers.split(","):
+            v1 = path or "/"
+    return v2, v1
+
+def _ancestors(path: str) -> List[str]:
+    # "/a/b" -> ["/a/b", "/a", "/"]; any level may carry the tightest quota
+    out = [path.rstrip("/") or "/"]
+    while out[-1] != "/":
+        out.append(os.path.dirname(out[-1]))
+    return out
+
+def _cgroup_file(root: str, path: str, name: str) -> str:
+    return root + path.rstrip("/") + "/" + name
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    v2_path, v1_path = _own_cgroups()
+    limits = []
+    found_v2 = False
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    for path in _ancestors(v2_path):
+        line = _read_first_line(_cgroup_file("/sys/fs/cgroup", path, "cpu.max"))
+        if not line:
+            continue
+        found_v2 = True
+        parts = line.split()
+        if len(parts) == 2 and parts[0] != "max":
+            try:
+                limits.append(int(parts[0]) / int(parts[1]))
+            except (ValueError, ZeroDivisionError):
+                pass
+    if found_v2:
+        return min(limits) if limits else None
+    # cgroup v1: quota of -1 means unlimited
+    for path in _ancestors(v1_path):
+        quota = _read_first_line(_cgroup_file("/sys/fs/cgroup/cpu", path, "cpu.cfs_quota_us"))
+        period = _read_first_line(_cgroup_file("/sys/fs/cgroup/cpu", path, "cpu.cfs_period_us"))
+        try:
+            if quota and period and int(quota) > 0:
+                limits.append(int(quota) / int(period))
+        except (ValueError, ZeroDivisionError):
+            pass
+    return min(limits) if limits else None
+
+def available_cpus() -> int:
+    """Number of cores this process may actually use.
+    Takes the minimum of the host count, the CPU affinity mask and any
+    cgroup (container) quota. NUM_CPUS overrides detection.
+    """
+    override = os.environ.get("NUM_CPUS")
+    if override:
+        try:
+            return max(1, int(override))
+        except ValueError:
+            pass
+    cpus = os.cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        cpus = min(cpus, len(os.sched_getaffinity(0)))
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        # A fractional quota still gets one core's worth of time slices
+        cpus = min(cpus, max(1, int(limit)))
+    return max(1, cpus)
+
+class CpuScheduler:
+    """Splits the available cores between PDF parsing workers and torch
+    threads, and re-pins torch's thread pool as the pipeline changes stage.
+    """
+
+    def __init__(self, cores: Optional[int] = None, enabled: bool = True):
+        self.cores = cores or available_cpus()
+        self.enabled = enabled
+        self.stage_name = None
+
+    def plan(self, stage: str) -> Dict[str, int]:
+        """Return {parse_workers, torch_threads} for a stage."""
+        if stage == PARSE:
+            # All cores to parsing processes; keep torch out of their way
+            return {"parse_workers": self.cores, "torch_threads": 1}
+        if stage == EMBED:
+            return {"parse_workers": 1, "torch_threads": self.cores}
+        raise ValueError(f"Unknown stage: {stage}")
+
+    def parse_workers(self) -> int:
+        if not self.enabled:
+            return 1
+        return self.plan(PARSE)["parse_workers"]
+
+    def limit_native_threads(self) -> None:
+        """Cap OpenMP/BLAS pools via the environment. Only effective when
+        called before torch/numpy are imported; explicit settings win.
+        """
+        if not self.enabled:
+            return
+        for var in _THREAD_ENV_VARS:
+            os.environ.setdefault(var, str(self.cores))
+
+    def _pin_torch(self, threads: int) -> None:
+        # Nothing to pin until the embed stage has loaded torch
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return
+        torch.set_num_threads(threads)
+        try:
+            # Can only be set once, before any inter-op work has started
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+
+    @contextmanager
+    def stage(self, name: str):
+        """Apply the plan for `name` for the duration of the block."""
+        plan = self.plan(name)
+        previous = self.stage_name
+        self.stage_name = name
+        if self.enabled:
+            self._pin_torch(plan["torch_threads"])
+        try:
+            yield plan
+        finally:
+            self.stage_name = previous
+            if self.enabled and previous is not None:
+                self._pin_torch(self.plan(previous)["torch_threads"])
+
+def get_scheduler() -> CpuScheduler:
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        enabled = os.environ.get("CPU_SCHEDULER", "1").lower() not in ("0", "false", "off")
+        _SCHEDULER = CpuScheduler(enabled=enabled)
+    return _SCHEDULER
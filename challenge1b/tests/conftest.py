@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Tests import the app packages (round1b, utils) the same way main.py does;
+# round1a is shared with challenge1a
+_HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _HERE)
+sys.path.append(os.path.join(os.path.dirname(_HERE), "challenge1a"))
@@ -0,0 +1,110 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from utils.archive_utils import (
+    is_archive, iter_archive_pdfs, list_archive_pdfs, read_member,
+    resolve_archive, scan_archive, supports_random_access,
+)
+
+MEMBERS = {
+    "a.pdf": b"%PDF-1.4 first document " * 200,
+    "sub/dir/B.PDF": b"%PDF-1.7 second \x00\xff binary " * 50,
+    "empty.pdf": b"",
+    "notes.txt": b"not a pdf",
+    "__MACOSX/._a.pdf": b"resource fork",
+}
+PDFS = {k: v for k, v in MEMBERS.items() if k.endswith((".pdf", ".PDF")) and "._" not in k}
+
+def _write_zip(path, compression):
+    with zipfile.ZipFile(path, "w", compression) as zf:
+        for name, data in MEMBERS.items():
+            info = zipfile.ZipInfo(name)
+            info.compress_type = compression
+            # Non-empty extra field so the local header length is exercised
+            info.extra = b"\xfe\xca\x04\x00test"
+            zf.writestr(info, data)
+
+def _write_tar(path, mode):
+    with tarfile.open(path, mode) as tf:
+        d = tarfile.TarInfo("sub")
+        d.type = tarfile.DIRTYPE
+        tf.addfile(d)
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+@pytest.fixture(params=["stored.zip", "deflated.zip", "bzip2.zip", "plain.tar", "packed.tar.gz"])
+def archive(request, tmp_path):
+    path = str(tmp_path / request.param)
+    if request.param == "stored.zip":
+        _write_zip(path, zipfile.ZIP_STORED)
+    elif request.param == "deflated.zip":
+        _write_zip(path, zipfile.ZIP_DEFLATED)
+    elif request.param == "bzip2.zip":
+        _write_zip(path, zipfile.ZIP_BZIP2)
+    elif request.param == "plain.tar":
+        _write_tar(path, "w")
+    else:
+        _write_tar(path, "w:gz")
+    return path
+
+def test_lists_only_pdfs(archive):
+    assert is_archive(archive)
+    assert list_archive_pdfs(archive) == sorted(PDFS)
+
+def test_iter_round_trip(archive):
+    assert dict(iter_archive_pdfs(archive)) == PDFS
+
+def test_read_member_round_trip(archive):
+    refs = scan_archive(archive)
+    if not supports_random_access(archive):
+        assert all(r.offset == -1 for r in refs)
+        with pytest.raises(ValueError):
+            read_member(refs[0])
+        return
+    assert {r.name: read_member(r) for r in refs} == PDFS
+
+def _corrupt(path, ref, at=10):
+    with open(path, "r+b") as fh:
+        fh.seek(ref.offset + at)
+        byte = fh.read(1)
+        fh.seek(ref.offset + at)
+        fh.write(bytes([byte[0] ^ 0xFF]))
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2])
+def test_corrupt_zip_member_raises(tmp_path, compression):
+    path = str(tmp_path / "bad.zip")
+    _write_zip(path, compression)
+    ref = next(r for r in scan_archive(path) if r.name == "a.pdf")
+    _corrupt(path, ref)
+    with pytest.raises(zipfile.BadZipFile):
+        read_member(ref)
+
+def test_truncated_zip_member_raises(tmp_path):
+    path = str(tmp_path / "short.zip")
+    _write_zip(path, zipfile.ZIP_STORED)
+    ref = next(r for r in scan_archive(path) if r.name == "a.pdf")
+    with pytest.raises(zipfile.BadZipFile):
+        read_member(ref._replace(size=ref.size - 1))
+
+def test_truncated_tar_member_raises(tmp_path):
+    path = str(tmp_path / "short.tar")
+    _write_tar(path, "w")
+    ref = next(r for r in scan_archive(path) if r.name == "a.pdf")
+    assert ref.crc is None
+    with open(path, "r+b") as fh:
+        fh.truncate(ref.offset + 5)
+    with pytest.raises(tarfile.ReadError):
+        read_member(ref)
+
+def test_resolve_archive(tmp_path):
+    folder = tmp_path / "PDFs"
+    assert resolve_archive(str(folder)) is None
+    _write_zip(str(tmp_path / "PDFs.zip"), zipfile.ZIP_STORED)
+    assert resolve_archive(str(folder)) == str(tmp_path / "PDFs.zip")
+    folder.mkdir()
+    assert not is_archive(str(folder))
@@ -0,0 +1,161 @@
+import io
+import os
+import sys
+import tarfile
+import types
+import zipfile
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from round1b import processor
+from round1b.scheduler import CpuScheduler
+
+def _pdf_bytes(title, words):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), title.upper(), fontsize=18, fontname="hebo")
+    for i in range(10):
+        page.insert_text((72, 110 + 20 * i), f"{words} line {i}.", fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+DOCS = {
+    "a.pdf": _pdf_bytes("Alpha overview", "apples and avocados"),
+    "c.pdf": _pdf_bytes("Coast guide", "beaches and cliffs"),
+}
+NESTED = {"sub/B.PDF": _pdf_bytes("Budget notes", "bread and butter")}
+
+def _embed(texts, *args, **kwargs):
+    # Deterministic stand-in for the sentence-transformer
+    vecs = np.array([[t.count(c) + 1.0 for c in "abcdeilnorstu"] for t in texts], dtype="float32")
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+@pytest.fixture(autouse=True)
+def stub_ranker(monkeypatch):
+    stub = types.ModuleType("round1b.semantic_ranker")
+    stub.embed_texts = _embed
+    stub.cosine_sim_matrix = lambda a, b: a @ b.T
+    monkeypatch.setitem(sys.modules, "round1b.semantic_ranker", stub)
+    monkeypatch.setattr(processor, "get_scheduler", lambda: CpuScheduler(cores=1))
+    yield
+    if processor._POOL is not None:
+        processor._POOL.shutdown()
+        processor._POOL = None
+
+def _folder(tmp_path, members):
+    d = tmp_path / "PDFs"
+    d.mkdir()
+    for name, data in members.items():
+        (d / name).write_bytes(data)
+    return str(d)
+
+def _zip(tmp_path, members, prefix="PDFs/"):
+    path = str(tmp_path / "PDFs.zip")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(prefix + name, data)
+    return path
+
+def _targz(tmp_path, members, prefix="PDFs/"):
+    path = str(tmp_path / "PDFs.tar.gz")
+    with tarfile.open(path, "w:gz") as tf:
+        for name, data in members.items():
+            info = tarfile.TarInfo(prefix + name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+QUERY = {"persona": "Traveller", "job": "Find beaches", "top_k": 5}
+
+def _ranking(result):
+    return [(s["document"], s["section_title"], s["page_number"]) for s in result["extracted_sections"]]
+
+@pytest.mark.parametrize("make_archive", [_zip, _targz])
+def test_archive_matches_folder(tmp_path, make_archive):
+    folder = processor.process_collection(_folder(tmp_path, DOCS), QUERY)
+    packed = processor.process_collection(make_archive(tmp_path, DOCS), QUERY)
+    assert sorted(packed["metadata"]["input_documents"]) == sorted(folder["metadata"]["input_documents"])
+    assert _ranking(packed) == _ranking(folder)
+
+def test_nested_members_report_relative_path(tmp_path):
+    result = processor.process_collection(_zip(tmp_path, {**DOCS, **NESTED}), QUERY)
+    assert result["metadata"]["input_documents"] == ["a.pdf", "c.pdf", "sub/B.PDF"]
+
+def test_same_basename_in_two_folders(tmp_path):
+    members = {"a/x.pdf": DOCS["a.pdf"], "b/x.pdf": DOCS["c.pdf"]}
+    path = _zip(tmp_path, members, prefix="")
+    result = processor.process_collection(path, QUERY)
+    assert result["metadata"]["input_documents"] == ["a/x.pdf", "b/x.pdf"]
+    # An ambiguous bare name matches nothing; the relative path picks one
+    assert processor.process_collection(path, {**QUERY, "documents": ["x.pdf"]})["extracted_sections"] == []
+    picked = processor.process_collection(path, {**QUERY, "documents": ["b/x.pdf"]})
+    assert {s["document"] for s in picked["extracted_sections"]} == {"b/x.pdf"}
+
+def test_query_documents_map_to_members(tmp_path):
+    path = _zip(tmp_path, {**DOCS, **NESTED})
+    for name in ("c.pdf", "PDFs/c.pdf", "/some/where/c.pdf"):
+        result = processor.process_collection(path, {**QUERY, "documents": [name]})
+        assert {s["document"] for s in result["extracted_sections"]} == {"c.pdf"}
+    result = processor.process_collection(path, {**QUERY, "documents": ["sub/B.PDF", "missing.pdf"]})
+    assert {s["document"] for s in result["extracted_sections"]} == {"sub/B.PDF"}
+
+@pytest.mark.parametrize("make_archive", [_zip, _targz])
+def test_archive_indexed_once_per_collection(tmp_path, monkeypatch, make_archive):
+    path = make_archive(tmp_path, DOCS)
+    scans, passes = [], []
+    real_scan, real_iter = processor.scan_archive, processor.iter_archive_pdfs
+    monkeypatch.setattr(processor, "scan_archive", lambda p: scans.append(p) or real_scan(p))
+    monkeypatch.setattr(processor, "iter_archive_pdfs", lambda p: passes.append(p) or real_iter(p))
+    out = processor.process_documents(path, [{"query": "beaches"}, {"query": "apples"}])
+    assert len(out["results"]) == 2
+    assert len(scans) == 1
+    # tar.gz: one streaming pass to parse, on top of the index pass
+    assert len(passes) == (1 if make_archive is _targz else 0)
+
+def test_streamed_parse_bounds_in_flight(tmp_path, monkeypatch):
+    members = {f"d{i:02d}.pdf": DOCS["a.pdf"] for i in range(9)}
+    refs = processor.scan_archive(_targz(tmp_path, members))
+    pending, peak = [], []
+
+    class FakePool:
+        def submit(self, fn, name, data):
+            fut = Future()
+            fut.payload = (fn, name, data)
+            pending.append(fut)
+            peak.append(sum(not f.done() for f in pending))
+            return fut
+
+    def fake_wait(futures, return_when):
+        # Finish the oldest outstanding job
+        fut = next(f for f in pending if not f.done())
+        fn, name, data = fut.payload
+        fut.set_result(fn(name, data))
+        return {fut}, set(f for f in futures if not f.done())
+
+    monkeypatch.setattr(processor, "_get_pool", lambda workers: FakePool())
+    monkeypatch.setattr(processor, "wait", fake_wait)
+    # Futures still pending at the end are resolved by result(); fill them in first
+    real_result = Future.result
+    def result(self, timeout=None):
+        if not self.done():
+            fn, name, data = self.payload
+            self.set_result(fn(name, data))
+        return real_result(self, timeout)
+    monkeypatch.setattr(Future, "result", result)
+
+    parsed = processor._parse_streamed(refs, workers=2)
+    assert len(parsed) == 9 and all(parsed)
+    # 2 workers -> never more than 4 PDFs handed over and unparsed
+    assert max(peak) == 4
+
+def test_worker_pool_matches_serial(tmp_path, monkeypatch):
+    path = _zip(tmp_path, {**DOCS, **NESTED})
+    serial = processor.process_collection(path, QUERY)
+    monkeypatch.setattr(processor, "get_scheduler", lambda: CpuScheduler(cores=2))
+    pooled = processor.process_collection(path, QUERY)
+    assert _ranking(pooled) == _ranking(serial)
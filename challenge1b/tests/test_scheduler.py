@@ -0,0 +1,131 @@
+import pytest
+
+from round1b import scheduler
+from round1b.scheduler import CpuScheduler, PARSE, EMBED
+
+V2 = "/sys/fs/cgroup/cpu.max"
+V1_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+V1_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+def _fake_cgroup(monkeypatch, files, proc_self=("0::/",)):
+    monkeypatch.setattr(scheduler, "_read_first_line", lambda path: files.get(path))
+    monkeypatch.setattr(scheduler, "_read_lines",
+                        lambda path: list(proc_self) if path == "/proc/self/cgroup" else [])
+
+@pytest.fixture
+def eight_cores(monkeypatch):
+    monkeypatch.delenv("NUM_CPUS", raising=False)
+    monkeypatch.setattr(scheduler.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(scheduler.os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+
+def test_v2_unlimited(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {V2: "max 100000"})
+    assert scheduler._cgroup_cpu_limit() is None
+    assert scheduler.available_cpus() == 8
+
+def test_v2_quota(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {V2: "150000 100000"})
+    assert scheduler._cgroup_cpu_limit() == 1.5
+    assert scheduler.available_cpus() == 1
+
+def test_v2_fractional_quota_keeps_one_core(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {V2: "50000 100000"})
+    assert scheduler._cgroup_cpu_limit() == 0.5
+    assert scheduler.available_cpus() == 1
+
+def test_v2_quota_above_host(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {V2: "1600000 100000"})
+    assert scheduler.available_cpus() == 8
+
+def test_v1_unlimited(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {V1_QUOTA: "-1", V1_PERIOD: "100000"})
+    assert scheduler._cgroup_cpu_limit() is None
+    assert scheduler.available_cpus() == 8
+
+def test_v1_quota(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {V1_QUOTA: "400000", V1_PERIOD: "100000"})
+    assert scheduler.available_cpus() == 4
+
+def test_v2_nested_cgroup(monkeypatch, eight_cores):
+    # Host cgroup namespace: the quota sits on our own cgroup, not the root
+    _fake_cgroup(monkeypatch, {
+        "/sys/fs/cgroup/cpu.max": "max 100000",
+        "/sys/fs/cgroup/kubepods/pod1/ctr/cpu.max": "200000 100000",
+    }, proc_self=["0::/kubepods/pod1/ctr"])
+    assert scheduler.available_cpus() == 2
+
+def test_v2_parent_slice_is_tighter(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {
+        "/sys/fs/cgroup/batch.slice/cpu.max": "300000 100000",
+        "/sys/fs/cgroup/batch.slice/job.scope/cpu.max": "max 100000",
+    }, proc_self=["0::/batch.slice/job.scope"])
+    assert scheduler.available_cpus() == 3
+
+def test_v1_nested_cgroup(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {
+        V1_QUOTA: "-1", V1_PERIOD: "100000",
+        "/sys/fs/cgroup/cpu/docker/abc/cpu.cfs_quota_us": "250000",
+        "/sys/fs/cgroup/cpu/docker/abc/cpu.cfs_period_us": "100000",
+    }, proc_self=["4:memory:/docker/abc", "2:cpu,cpuacct:/docker/abc", "1:cpuset:/"])
+    assert scheduler.available_cpus() == 2
+
+def test_nested_path_missing_falls_back_to_root(monkeypatch, eight_cores):
+    # Private namespace with a stale path in /proc/self/cgroup
+    _fake_cgroup(monkeypatch, {V2: "400000 100000"}, proc_self=["0::/docker/gone"])
+    assert scheduler.available_cpus() == 4
+
+def test_affinity_mask(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {})
+    monkeypatch.setattr(scheduler.os, "sched_getaffinity", lambda pid: {0, 1, 2})
+    assert scheduler.available_cpus() == 3
+
+def test_num_cpus_override(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {V2: "100000 100000"})
+    monkeypatch.setenv("NUM_CPUS", "6")
+    assert scheduler.available_cpus() == 6
+
+def test_invalid_num_cpus_falls_back(monkeypatch, eight_cores):
+    _fake_cgroup(monkeypatch, {V2: "200000 100000"})
+    monkeypatch.setenv("NUM_CPUS", "lots")
+    assert scheduler.available_cpus() == 2
+
+def test_plan_splits_cores():
+    s = CpuScheduler(cores=4)
+    assert s.plan(PARSE) == {"parse_workers": 4, "torch_threads": 1}
+    assert s.plan(EMBED) == {"parse_workers": 1, "torch_threads": 4}
+    with pytest.raises(ValueError):
+        s.plan("train")
+
+def test_disabled_scheduler_parses_serially():
+    assert CpuScheduler(cores=4, enabled=False).parse_workers() == 1
+
+def test_stage_restores_previous(monkeypatch):
+    s = CpuScheduler(cores=4)
+    pinned = []
+    monkeypatch.setattr(s, "_pin_torch", pinned.append)
+    with s.stage(EMBED):
+        with s.stage(PARSE):
+            assert s.stage_name == PARSE
+        assert s.stage_name == EMBED
+    assert s.stage_name is None
+    # embed, parse, then back to embed's thread count on exit
+    assert pinned == [4, 1, 4]
+
+def test_stage_restores_on_error(monkeypatch):
+    s = CpuScheduler(cores=4)
+    pinned = []
+    monkeypatch.setattr(s, "_pin_torch", pinned.append)
+    with s.stage(EMBED):
+        with pytest.raises(RuntimeError):
+            with s.stage(PARSE):
+                raise RuntimeError("boom")
+        assert s.stage_name == EMBED
+    assert pinned == [4, 1, 4]
+
+def test_disabled_stage_does_not_pin(monkeypatch):
+    s = CpuScheduler(cores=4, enabled=False)
+    pinned = []
+    monkeypatch.setattr(s, "_pin_torch", pinned.append)
+    with s.stage(PARSE):
+        pass
+    assert pinned == []
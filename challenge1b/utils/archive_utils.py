@@ -0,0 +1,146 @@
+import os, bz2, struct, tarfile, zipfile, zlib
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+ARCHIVE_EXTS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+# Zip local file header: signature, then fixed fields up to the two length words
+_ZIP_LOCAL_HEADER = struct.Struct('<4s22xHH')
+
+class MemberRef(NamedTuple):
+    """Where a member's bytes live inside the archive. Everything a worker
+    needs to read it, so the archive index is never parsed again.
+    """
+    archive_path: str
+    name: str
+    offset: int  # -1 for compressed tars, which can only be streamed
+    size: int  # bytes stored in the archive
+    compress_type: int  # zipfile.ZIP_* constant; tar members are ZIP_STORED
+    file_size: int  # bytes after decompression
+    crc: Optional[int] = None  # zip CRC-32; tar has no per-member checksum
+
+def _is_pdf_name(name: str) -> bool:
+    return name.lower().endswith('.pdf') and not os.path.basename(name).startswith('._')
+
+def is_archive(path: str) -> bool:
+    if not os.path.isfile(path):
+        return False
+    return zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+
+def resolve_archive(path: str) -> Optional[str]:
+    """Return `path` if it is an archive, else the first `path + ext` archive
+    next to it (e.g. input/PDFs -> input/PDFs.zip), else None.
+    """
+    if is_archive(path):
+        return path
+    for ext in ARCHIVE_EXTS:
+        if is_archive(path + ext):
+            return path + ext
+    return None
+
+def _scan_zip(archive_path: str) -> List[MemberRef]:
+    refs = []
+    with open(archive_path, 'rb') as fh, zipfile.ZipFile(fh) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not _is_pdf_name(info.filename):
+                continue
+            if info.flag_bits & 0x1:
+                print(f"Skipping encrypted archive member {info.filename}")
+                continue
+            fh.seek(info.header_offset)
+            sig, name_len, extra_len = _ZIP_LOCAL_HEADER.unpack(fh.read(_ZIP_LOCAL_HEADER.size))
+            if sig != b'PK\x03\x04':
+                raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+            offset = info.header_offset + _ZIP_LOCAL_HEADER.size + name_len + extra_len
+            refs.append(MemberRef(archive_path, info.filename, offset, info.compress_size,
+                                  info.compress_type, info.file_size, info.CRC))
+    return refs
+
+def _open_plain_tar(archive_path: str) -> Optional[tarfile.TarFile]:
+    try:
+        return tarfile.open(archive_path, 'r:')
+    except tarfile.ReadError:
+        return None
+
+def supports_random_access(archive_path: str) -> bool:
+    """Zip and uncompressed tar members can be read independently; compressed
+    tars have to be decompressed from the start, so read them sequentially.
+    """
+    if zipfile.is_zipfile(archive_path):
+        return True
+    tf = _open_plain_tar(archive_path)
+    if tf is None:
+        return False
+    tf.close()
+    return True
+
+def scan_archive(archive_path: str) -> List[MemberRef]:
+    """Index every PDF member in a single pass over the archive, sorted by
+    name. Members of compressed tars get offset -1: read them with
+    iter_archive_pdfs instead of read_member.
+    """
+    if zipfile.is_zipfile(archive_path):
+        refs = _scan_zip(archive_path)
+    else:
+        tf = _open_plain_tar(archive_path)
+        if tf is not None:
+            with tf:
+                refs = [MemberRef(archive_path, m.name, m.offset_data, m.size, zipfile.ZIP_STORED, m.size)
+                        for m in tf.getmembers() if m.isfile() and _is_pdf_name(m.name)]
+        else:
+            with tarfile.open(archive_path, 'r|*') as tf:
+                refs = [MemberRef(archive_path, m.name, -1, m.size, zipfile.ZIP_STORED, m.size)
+                        for m in tf if m.isfile() and _is_pdf_name(m.name)]
+    return sorted(refs, key=lambda r: r.name)
+
+def list_archive_pdfs(archive_path: str) -> List[str]:
+    return [r.name for r in scan_archive(archive_path)]
+
+def _check(ref: MemberRef, data: bytes) -> bytes:
+    # The same length and CRC checks ZipFile.read makes
+    error = tarfile.ReadError if ref.crc is None else zipfile.BadZipFile
+    if len(data) != ref.file_size:
+        raise error(f"Truncated member {ref.name}: {len(data)} of {ref.file_size} bytes")
+    if ref.crc is not None and zlib.crc32(data) != ref.crc:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for member {ref.name}")
+    return data
+
+def _read_ref(fh, ref: MemberRef) -> bytes:
+    fh.seek(ref.offset)
+    raw = fh.read(ref.size)
+    try:
+        if ref.compress_type == zipfile.ZIP_STORED:
+            return _check(ref, raw)
+        if ref.compress_type == zipfile.ZIP_DEFLATED:
+            return _check(ref, zlib.decompress(raw, -zlib.MAX_WBITS))
+        if ref.compress_type == zipfile.ZIP_BZIP2:
+            return _check(ref, bz2.decompress(raw))
+    except (zlib.error, OSError, EOFError) as e:
+        raise zipfile.BadZipFile(f"Corrupt member {ref.name}: {e}") from e
+    # Rare methods (e.g. LZMA): let zipfile decode and verify it
+    with zipfile.ZipFile(ref.archive_path) as zf:
+        return zf.read(ref.name)
+
+def read_member(ref: MemberRef) -> bytes:
+    """Read one member's bytes with a single seek + read, without
+    extracting to disk or re-parsing the archive index.
+    """
+    if ref.offset < 0:
+        raise ValueError(f"{ref.name} is in a compressed tar; use iter_archive_pdfs")
+    with open(ref.archive_path, 'rb') as fh:
+        return _read_ref(fh, ref)
+
+def iter_archive_pdfs(archive_path: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (member_name, pdf_bytes) one member at a time so only a single
+    PDF is held in memory.
+    """
+    if supports_random_access(archive_path):
+        refs = scan_archive(archive_path)
+        with open(archive_path, 'rb') as fh:
+            for ref in refs:
+                yield ref.name, _read_ref(fh, ref)
+        return
+    # Compressed tar: single streaming pass
+    with tarfile.open(archive_path, 'r|*') as tf:
+        for info in tf:
+            if info.isfile() and _is_pdf_name(info.name):
+                yield info.name, tf.extractfile(info).read()